@@ -1,12 +1,26 @@
 # castenv/__init__.py
 from __future__ import annotations
 
+import copy
 import json
 import os
 import re
+import sys
 from dataclasses import dataclass, field, replace
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
 from contextlib import contextmanager
 
 __all__ = [
@@ -32,9 +46,12 @@ __version__ = "0.3.0"
 # Normalization primitives
 # =========================
 
-_NULL_SENTINELS = {"null", "none", "nil", "undefined"}
-_TRUE_SENTINELS = {"true", "yes", "y", "on", "1"}
-_FALSE_SENTINELS = {"false", "no", "n", "off", "0"}
+_NULL_SENTINELS = frozenset({"null", "none", "nil", "undefined"})
+_TRUE_SENTINELS = frozenset({"true", "yes", "y", "on", "1"})
+_FALSE_SENTINELS = frozenset({"false", "no", "n", "off", "0"})
+_BOOL_SENTINELS = _TRUE_SENTINELS | _FALSE_SENTINELS
+
+_NO_RESULT = object()  # sentinel: “no match yet”
 
 _SIZE_UNITS_IEC = {  # powers of 1024
     "b": 1,
@@ -58,7 +75,42 @@ _SIZE_UNITS_SI = {  # powers of 1000 (triggered by uppercase unit tokens like MB
     "tb_si": 1000**4,
 }
 
+_NUMBER_RE = re.compile(
+    r"""
+    \s*(?:  # blanks around a number are ignored, e.g. a quoted " 0xff "
+    (?P<hex>0[xX](?:_?[0-9a-fA-F])+)
+    |(?P<bin>0[bB](?:_?[01])+)
+    |(?P<oct>0[oO](?:_?[0-7])+)
+    |(?P<int>[+-]?\d+)
+    |(?P<flt>[+-]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?)
+    )\s*
+    """,
+    re.VERBOSE,
+)
+_NUMBER_BASES = {"hex": 16, "bin": 2, "oct": 8}
+
+_DURATION_UNITS = {  # unit -> (multiplier, divisor) in seconds; exact for floats
+    "ns": (1, 1_000_000_000),
+    "us": (1, 1_000_000),
+    "µs": (1, 1_000_000),
+    "ms": (1, 1000),
+    "s": (1, 1),
+    "m": (60, 1),
+    "h": (3600, 1),
+    "d": (86400, 1),
+    "w": (604800, 1),
+}
 _DURATION_PART = re.compile(r"(?P<value>\d+(?:\.\d+)?)(?P<unit>ns|us|µs|ms|s|m|h|d|w)")
+# Sizes need an explicit unit; bare numbers are left to the number parser.
+_BYTES_RE = re.compile(r"\s*(?P<num>[+-]?\d+(?:\.\d+)?)\s*(?P<unit>[A-Za-z]+)\s*")
+# One pass over a value finds the first of duration / byte size / number that
+# can match (alternation is ordered), so normalize() skips the stages before it.
+_CLASSIFY_RE = re.compile(
+    r"(?P<dur>(?:\d+(?:\.\d+)?(?:ns|us|µs|ms|s|m|h|d|w))+)"
+    r"|(?P<size>\s*(?P<size_num>[+-]?\d+(?:\.\d+)?)\s*(?P<size_unit>[A-Za-z]+)\s*)"
+    r"|" + _NUMBER_RE.pattern,
+    re.VERBOSE,
+)
 _ENV_VAR_PATTERN = re.compile(
     r"""
     \$\{
@@ -72,42 +124,35 @@ _ENV_VAR_PATTERN = re.compile(
     """,
     re.VERBOSE,
 )
+_QUOTED_ESCAPES = {
+    r"\\": "\\",
+    r"\"": '"',
+    r"\'": "'",
+    r"\n": "\n",
+    r"\r": "\r",
+    r"\t": "\t",
+    r"\b": "\b",
+    r"\f": "\f",
+    r"\0": "\0",
+}
+_QUOTED_ESCAPE_RE = re.compile(r"\\[\\\"'nrtbf0]")
 
 
 def _interpolate_env(s: str) -> str:
     def repl(m: re.Match) -> str:
-        if m.group("name"):
-            name = m.group("name")
-            default = m.group("default")
+        name, default, short = m.groups()
+        if name:
             return os.environ.get(name, default if default is not None else "")
         else:
-            short = m.group("short")
             return os.environ.get(short, "")
 
     return _ENV_VAR_PATTERN.sub(repl, s)
 
 
 def _unescape_quoted(s: str) -> str:
-    escapes = {
-        r"\\": "\\",
-        r"\"": '"',
-        r"\'": "'",
-        r"\n": "\n",
-        r"\r": "\r",
-        r"\t": "\t",
-        r"\b": "\b",
-        r"\f": "\f",
-        r"\0": "\0",
-    }
-    for k, v in escapes.items():
-        s = s.replace(k, v)
-    return s
-
-
-def _strip_matching_quotes(s: str) -> Tuple[str, bool]:
-    if len(s) >= 2 and s[0] == s[-1] and s[0] in {'"', "'"}:
-        return s[1:-1], True
-    return s, False
+    if "\\" not in s:
+        return s
+    return _QUOTED_ESCAPE_RE.sub(lambda m: _QUOTED_ESCAPES[m.group(0)], s)
 
 
 def _try_json(val: str) -> Tuple[bool, Any]:
@@ -119,65 +164,46 @@ def _try_json(val: str) -> Tuple[bool, Any]:
 
 
 def _try_number(val: str) -> Tuple[bool, float | int]:
-    if val.startswith(("0x", "0X")):
-        try:
-            return True, int(val, 16)
-        except ValueError:
-            return False, 0
-    if val.startswith(("0b", "0B")):
-        try:
-            return True, int(val, 2)
-        except ValueError:
-            return False, 0
-    if val.startswith(("0o", "0O")):
-        try:
-            return True, int(val, 8)
-        except ValueError:
-            return False, 0
-    try:
-        if re.fullmatch(r"[+-]?\d+", val):
-            return True, int(val)
-        if re.fullmatch(r"[+-]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?", val):
-            return True, float(val)
-        return False, 0.0
-    except ValueError:
-        return False, 0.0
+    m = _NUMBER_RE.fullmatch(val)
+    # Every alternative is a named group, so a match always has a lastgroup
+    if m is None or m.lastgroup is None:
+        return False, 0
+    return True, _number_from_kind(m.lastgroup, val)
 
 
-def _parse_duration_to_seconds(val: str) -> float | None:
-    pos = 0
+def _number_from_kind(kind: str, val: str) -> float | int:
+    if kind == "int":
+        return int(val)
+    if kind == "flt":
+        return float(val)
+    return int(val, _NUMBER_BASES[kind])
+
+
+def _is_decimal_int(val: str) -> bool:
+    digits = val[1:] if val[:1] in ("+", "-") else val
+    return digits.isascii() and digits.isdigit()
+
+
+def _duration_seconds(val: str) -> float:
+    # val already matched the "dur" alternative of _CLASSIFY_RE in full, so
+    # the parts are contiguous; a repeated group only keeps its last capture,
+    # hence the second scan to read each value/unit pair.
     total_seconds = 0.0
-    for m in _DURATION_PART.finditer(val):
-        if m.start() != pos:
-            return None
-        amount = float(m.group("value"))
-        unit = m.group("unit")
-        if unit == "ns":
-            total_seconds += amount / 1_000_000_000
-        elif unit in ("us", "µs"):
-            total_seconds += amount / 1_000_000
-        elif unit == "ms":
-            total_seconds += amount / 1000
-        elif unit == "s":
-            total_seconds += amount
-        elif unit == "m":
-            total_seconds += amount * 60
-        elif unit == "h":
-            total_seconds += amount * 3600
-        elif unit == "d":
-            total_seconds += amount * 86400
-        elif unit == "w":
-            total_seconds += amount * 604800
-        pos = m.end()
-    return total_seconds if pos == len(val) else None
+    for value, unit in _DURATION_PART.findall(val):
+        mult, div = _DURATION_UNITS[unit]
+        total_seconds += float(value) * mult / div
+    return total_seconds
 
 
 def _parse_bytes(val: str) -> int | None:
-    m = re.fullmatch(r"\s*(?P<num>[+-]?\d+(?:\.\d+)?)\s*(?P<unit>[A-Za-z]+)?\s*", val)
+    m = _BYTES_RE.fullmatch(val)
     if not m:
         return None
-    num = float(m.group("num"))
-    unit_raw = m.group("unit") or "b"
+    return _bytes_from_parts(*m.groups())
+
+
+def _bytes_from_parts(num_str: str, unit_raw: str) -> int | None:
+    num = float(num_str)
     unit = unit_raw.lower()
 
     if unit in {"kb", "mb", "gb", "tb"} and any(ch.isupper() for ch in unit_raw):
@@ -189,6 +215,161 @@ def _parse_bytes(val: str) -> int | None:
     return int(num * factor)
 
 
+class _NormalizeOptions(NamedTuple):
+    coerce_empty_to_none: bool
+    coerce_null_strings: bool
+    parse_booleans: bool
+    parse_numbers: bool
+    parse_json: bool
+    parse_lists: bool
+    list_separators: Tuple[str, ...]
+    strip_quotes: bool
+    unescape_in_quotes: bool
+    interpolate_env: bool
+    expand_user: bool
+    parse_duration: bool
+    parse_bytesize: bool
+    percent_mode: str
+    lowercase_strings: bool
+
+
+def _normalize_str(value: str, options: _NormalizeOptions) -> Any:
+    # $VAR and ~ expansion depend on the process environment, so those results
+    # are never memoized.
+    # JSON documents are not memoized either: copying a cached tree costs
+    # more than letting json.loads() build a fresh one.
+    if (
+        (options.interpolate_env and "$" in value)
+        or (options.expand_user and "~" in value)
+        or (options.parse_json and value.lstrip().startswith(("{", "[")))
+    ):
+        return _parse_str(value, options)
+    result = _parse_str_cached(value, options)
+    # Cached lists/dicts are shared; hand callers their own copy. List items
+    # are nearly always scalars, so only nested containers get a deep copy.
+    if isinstance(result, list):
+        return [
+            copy.deepcopy(item) if isinstance(item, (list, dict)) else item
+            for item in result
+        ]
+    if isinstance(result, dict):
+        return copy.deepcopy(result)
+    return result
+
+
+def _parse_str(value: str, options: _NormalizeOptions) -> Any:
+    (
+        coerce_empty_to_none,
+        coerce_null_strings,
+        parse_booleans,
+        parse_numbers,
+        parse_json,
+        parse_lists,
+        list_separators,
+        strip_quotes,
+        unescape_in_quotes,
+        interpolate_env,
+        expand_user,
+        parse_duration,
+        parse_bytesize,
+        percent_mode,
+        lowercase_strings,
+    ) = options
+
+    s = value.strip()
+    if interpolate_env and ("$" in s):
+        s = _interpolate_env(s)
+    result: Any
+    if s == "":
+        result = None if coerce_empty_to_none else ""
+    else:
+        worked_from_quotes = False
+        if strip_quotes and s[0] in ('"', "'") and len(s) >= 2 and s[-1] == s[0]:
+            s = s[1:-1]
+            worked_from_quotes = True
+            if unescape_in_quotes:
+                s = _unescape_quoted(s)
+        if expand_user and s.startswith(("~/", "~\\")):
+            s = os.path.expanduser(s)
+
+        result = _NO_RESULT
+
+        # Fast path for plain integers (PORT=8080): skip the sentinel and
+        # pattern probes below. "0"/"1" remain booleans when those are parsed.
+        if (
+            parse_numbers
+            and s[:1] in "+-0123456789"
+            and _is_decimal_int(s)
+            and not (parse_booleans and s in ("0", "1"))
+        ):
+            result = int(s)
+        else:
+            # Most env values are already lowercase; avoid copying them
+            s_lower = s if (s.isascii() and s.islower()) else s.lower()
+            if coerce_null_strings and s_lower in _NULL_SENTINELS:
+                result = None
+            elif parse_booleans and s_lower in _BOOL_SENTINELS:
+                result = s_lower in _TRUE_SENTINELS
+            elif percent_mode != "none" and s.endswith("%"):
+                num_str = s[:-1].strip()
+                ok, _ = _try_number(num_str)
+                if ok:
+                    num = float(num_str)
+                    result = (num / 100.0) if percent_mode == "fraction" else num
+
+        if result is _NO_RESULT and (parse_duration or parse_bytesize or parse_numbers):
+            m = _CLASSIFY_RE.fullmatch(s)
+            kind = m.lastgroup if m else None
+            if kind == "dur" and parse_duration:
+                result = _duration_seconds(s)
+            if result is _NO_RESULT and kind in ("dur", "size") and parse_bytesize:
+                if kind == "size" and m is not None:
+                    bs = _bytes_from_parts(*m.group(3, 4))  # size_num, size_unit
+                else:
+                    bs = _parse_bytes(s)
+                if bs is not None:
+                    result = bs
+            if result is _NO_RESULT and kind is not None and parse_numbers:
+                if kind not in ("dur", "size"):
+                    result = _number_from_kind(kind, s)
+                else:
+                    # e.g. "0xFF" also reads as a size with unit "xFF"
+                    ok, num = _try_number(s)
+                    if ok:
+                        result = num
+
+        if result is _NO_RESULT and parse_json:
+            if s.startswith("{") or s.startswith("[") or worked_from_quotes:
+                ok, parsed = _try_json(s if not worked_from_quotes else value.strip())
+                if ok:
+                    result = parsed
+
+        if result is _NO_RESULT and parse_lists:
+            if len(list_separators) == 1:
+                sep = list_separators[0] if list_separators[0] in s else None
+            else:
+                sep = next((sep for sep in list_separators if sep in s), None)
+            if sep is not None:
+                parts = [p.strip() for p in s.split(sep)] if sep else [s]
+                element_options = options._replace(parse_lists=False)
+                result = [_normalize_str(p, element_options) for p in parts]
+
+        if result is _NO_RESULT:
+            result = s
+
+    if (
+        lowercase_strings
+        and isinstance(result, str)
+        and not (result.isascii() and result.islower())
+    ):
+        result = result.lower()
+
+    return result
+
+
+_parse_str_cached = lru_cache(maxsize=4096)(_parse_str)
+
+
 def normalize(
     value: Any,
     *,
@@ -215,100 +396,28 @@ def normalize(
 
     If a non-string (e.g., default=True/0/{}) is provided, it is returned as-is.
     """
-    _NO_RESULT = object()  # sentinel: “no match yet”
-
-    if value is None:
-        result = None
-    elif not isinstance(value, str):
-        # Pass through already-typed defaults/values unchanged
+    if not isinstance(value, str):
+        # Pass through None and already-typed defaults/values unchanged
         return value
-    else:
-        s = value.strip()
-        if interpolate_env and ("$" in s):
-            s = _interpolate_env(s)
-        if s == "":
-            result = None if coerce_empty_to_none else ""
-        else:
-            worked_from_quotes = False
-            if strip_quotes:
-                s, was_quoted = _strip_matching_quotes(s)
-                worked_from_quotes = was_quoted
-                if was_quoted and unescape_in_quotes:
-                    s = _unescape_quoted(s)
-            if expand_user and s.startswith(("~/", "~\\")):
-                s = os.path.expanduser(s)
-
-            s_lower = s.lower()
-            result: Any = _NO_RESULT
 
-            if coerce_null_strings and s_lower in _NULL_SENTINELS:
-                result = None
-            elif parse_booleans and s_lower in (_TRUE_SENTINELS | _FALSE_SENTINELS):
-                result = s_lower in _TRUE_SENTINELS
-            elif percent_mode != "none" and s.endswith("%"):
-                num_str = s[:-1].strip()
-                ok, _ = _try_number(num_str)
-                if ok:
-                    num = float(num_str)
-                    result = (num / 100.0) if percent_mode == "fraction" else num
-
-            if result is _NO_RESULT and parse_duration:
-                dur = _parse_duration_to_seconds(s)
-                if dur is not None:
-                    result = dur
-
-            if result is _NO_RESULT and parse_bytesize:
-                bs = _parse_bytes(s)
-                if bs is not None:
-                    result = bs
-
-            if result is _NO_RESULT and parse_numbers:
-                ok, num = _try_number(s)
-                if ok:
-                    result = num
-
-            if result is _NO_RESULT and parse_json:
-                if s.startswith("{") or s.startswith("[") or worked_from_quotes:
-                    ok, parsed = _try_json(
-                        s if not worked_from_quotes else value.strip()
-                    )
-                    if ok:
-                        result = parsed
-
-            if (
-                result is _NO_RESULT
-                and parse_lists
-                and any(sep in s for sep in list_separators)
-            ):
-                sep = next((sep for sep in list_separators if sep in s), None)
-                parts = [p.strip() for p in s.split(sep)] if sep else [s]
-                result = [
-                    normalize(
-                        p,
-                        coerce_empty_to_none=coerce_empty_to_none,
-                        coerce_null_strings=coerce_null_strings,
-                        parse_booleans=parse_booleans,
-                        parse_numbers=parse_numbers,
-                        parse_json=parse_json,
-                        parse_lists=False,
-                        strip_quotes=strip_quotes,
-                        unescape_in_quotes=unescape_in_quotes,
-                        interpolate_env=interpolate_env,
-                        expand_user=expand_user,
-                        parse_duration=parse_duration,
-                        parse_bytesize=parse_bytesize,
-                        percent_mode=percent_mode,
-                        lowercase_strings=lowercase_strings,
-                        enum=None,
-                    )
-                    for p in parts
-                ]
-
-            if result is _NO_RESULT:
-                result = s
-
-    if isinstance(result, str) and lowercase_strings:
-        result = result.lower()
+    options = _NormalizeOptions(
+        coerce_empty_to_none,
+        coerce_null_strings,
+        parse_booleans,
+        parse_numbers,
+        parse_json,
+        parse_lists,
+        tuple(list_separators),
+        strip_quotes,
+        unescape_in_quotes,
+        interpolate_env,
+        expand_user,
+        parse_duration,
+        parse_bytesize,
+        percent_mode,
+        lowercase_strings,
+    )
+    result = _normalize_str(value, options)
 
     if enum is not None and result is not None:
         choices = list(enum)
@@ -324,6 +433,21 @@ def normalize(
     return result
 
 
+# Options for a bare normalize(value) call, taken from its keyword defaults
+# (always present: every normalize() option is keyword-only).
+_NORMALIZE_KWDEFAULTS = cast(Dict[str, Any], normalize.__kwdefaults__)
+_DEFAULT_OPTIONS = _NormalizeOptions(
+    *(_NORMALIZE_KWDEFAULTS[name] for name in _NormalizeOptions._fields)
+)
+
+
+def _normalize_default(value: Any) -> Any:
+    # normalize(value) without the keyword binding and options packing
+    if not isinstance(value, str):
+        return value
+    return _normalize_str(value, _DEFAULT_OPTIONS)
+
+
 def normalize_config(
     obj: Any,
     *,
@@ -399,22 +523,41 @@ def normalize_config(
         "lowercase_strings": lowercase_strings,
         "enum": enum,
     }
-
-    if isinstance(obj, dict):
-        return {
-            key: normalize_config(value, **normalize_kwargs)
-            for key, value in obj.items()
-        }
-    elif isinstance(obj, list):
-        return [normalize_config(item, **normalize_kwargs) for item in obj]
-    elif isinstance(obj, str):
-        # First expand environment variables using layered sources
-        expanded = _expand_env_from_sources(obj)
-        # Then normalize/cast the result
-        return normalize(expanded, **normalize_kwargs)
-    else:
-        # Return other types as-is
-        return obj
+    return _normalize_config(obj, normalize_kwargs)
+
+
+def _normalize_config(obj: Any, normalize_kwargs: Mapping[str, Any]) -> Any:
+    # Iterative walk: each work item fills one slot of an already-shaped output
+    # container, so key order and list positions match the input and deep
+    # configs don't consume Python frames. Items are pushed in reverse so they
+    # are processed in document order.
+    max_depth = sys.getrecursionlimit()
+    root: List[Any] = [None]
+    stack: List[Tuple[Any, Any, Any, int]] = [(root, 0, obj, 0)]
+    while stack:
+        parent, slot, node, depth = stack.pop()
+        if isinstance(node, (dict, list)) and depth >= max_depth:
+            # Keep the recursive version's failure mode for self-referencing configs
+            raise RecursionError("maximum nesting depth exceeded in normalize_config")
+        if isinstance(node, dict):
+            out: Any = dict.fromkeys(node)
+            stack.extend((out, k, v, depth + 1) for k, v in reversed(node.items()))
+        elif isinstance(node, list):
+            out = [None] * len(node)
+            stack.extend(
+                (out, i, node[i], depth + 1) for i in range(len(node) - 1, -1, -1)
+            )
+        elif isinstance(node, str):
+            # First expand environment variables using layered sources,
+            # then normalize/cast the result
+            if "$" in node:
+                node = _expand_env_from_sources(node)
+            out = normalize(node, **normalize_kwargs)
+        else:
+            # Return other types as-is
+            out = node
+        parent[slot] = out
+    return root[0]
 
 
 # =======================================
@@ -423,6 +566,17 @@ def normalize_config(
 
 
 def _is_installed(module_name: str) -> bool:
+    # Modules already in sys.modules (including test doubles) win outright,
+    # and a None entry marks the import as blocked. Otherwise the import
+    # attempt is remembered so missing extras don't re-run the import
+    # machinery on every read.
+    if module_name in sys.modules:
+        return sys.modules[module_name] is not None
+    return _can_import(module_name)
+
+
+@lru_cache(maxsize=None)
+def _can_import(module_name: str) -> bool:
     try:
         __import__(module_name)
         return True
@@ -449,13 +603,23 @@ def _candidate_env_filenames(env_name: str | None) -> List[str]:
     return names
 
 
+_CWD_DIRS_CACHE: Tuple[str, Tuple[Path, ...]] | None = None
+
+
 def _default_search_dirs() -> List[Path]:
     """cwd + all parents up to filesystem root (first match wins by dir)."""
-    p = Path.cwd().resolve()
-    dirs: List[Path] = [p]
-    for parent in p.parents:
-        dirs.append(parent)
-    return dirs
+    global _CWD_DIRS_CACHE
+    cwd = os.getcwd()
+    cached = _CWD_DIRS_CACHE
+    if cached is None or cached[0] != cwd:
+        p = Path(cwd).resolve()
+        cached = (cwd, (p, *p.parents))
+        _CWD_DIRS_CACHE = cached
+    # Fresh list per plan: callers may hold on to (or mutate) search_dirs
+    return list(cached[1])
+
+
+_DotenvKey = Tuple[Tuple[str, ...], Tuple[str, ...], bool]
 
 
 @dataclass(frozen=True)
@@ -465,6 +629,20 @@ class DotenvSearchPlan:
     filenames: List[str] | None = None
     stop_at_first_found_dir: bool = True
 
+    def _cache_key(self) -> _DotenvKey:
+        """Key into the .env cache; resolved once per (immutable) plan."""
+        # Memoized as a plain instance attribute, not a field, so it stays out
+        # of fields()/asdict()/astuple().
+        key = self.__dict__.get("_resolved_key")
+        if key is None:
+            key = (
+                tuple(str(d.resolve()) for d in self.search_dirs),
+                tuple(self.filenames or _candidate_env_filenames(self.env_name)),
+                self.stop_at_first_found_dir,
+            )
+            object.__setattr__(self, "_resolved_key", key)
+        return key
+
     def resolve_files(self) -> List[Path]:
         candidates = self.filenames or _candidate_env_filenames(self.env_name)
         found: List[Path] = []
@@ -481,31 +659,31 @@ class DotenvSearchPlan:
         return found
 
 
-_DOTENV_CACHE: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], Mapping[str, str]] = {}
+_DOTENV_CACHE: Dict[_DotenvKey, Mapping[str, str]] = {}
+
+
+def _read_dotenv_file(path: Path) -> Mapping[str, str | None]:
+    from dotenv import dotenv_values  # type: ignore
+
+    try:
+        return dotenv_values(dotenv_path=str(path)) or {}
+    except Exception:
+        return {}
 
 
 def _load_dotenv_map(plan: DotenvSearchPlan) -> Mapping[str, str]:
-    key = (
-        tuple(str(d.resolve()) for d in plan.search_dirs),
-        tuple(plan.filenames or _candidate_env_filenames(plan.env_name)),
-    )
+    key = plan._cache_key()
     cached = _DOTENV_CACHE.get(key)
     if cached is not None:
         return cached
     if not _is_installed("dotenv"):
         _DOTENV_CACHE[key] = {}
         return _DOTENV_CACHE[key]
-    from dotenv import dotenv_values  # type: ignore
-
     merged: Dict[str, str] = {}
     for path in plan.resolve_files():
-        try:
-            data = dotenv_values(dotenv_path=str(path))
-            for k, v in (data or {}).items():
-                if v is not None:
-                    merged[k] = v
-        except Exception:
-            continue
+        for k, v in _read_dotenv_file(path).items():
+            if v is not None:
+                merged[k] = v
     _DOTENV_CACHE[key] = dict(merged)
     return _DOTENV_CACHE[key]
 
@@ -545,9 +723,14 @@ def configure(
     stop_at_first_found_dir: bool | None = None,
     prefer_os_over_dotenv: bool | None = None,
     use_decouple_if_available: bool | None = None,
+    refresh: bool = True,
 ) -> None:
     """
     Configure castenv once at app startup; afterwards just call get_env("KEY").
+
+    Cached .env mappings are cleared unless ``refresh=False``. They are keyed
+    by the resolved dirs, file names and stop_at_first_found_dir, so keeping
+    them is safe as long as the files on disk are unchanged.
     """
     global _GLOBAL
     cur = _ensure_global()
@@ -573,7 +756,8 @@ def configure(
             else cur.use_decouple_if_available
         ),
     )
-    refresh_dotenv_cache()
+    if refresh:
+        refresh_dotenv_cache()
 
 
 @contextmanager
@@ -605,9 +789,10 @@ _SENTINEL = _Sentinel()
 
 
 def _raw_from_decouple(key: str, default: Any = _SENTINEL) -> Any:
-    try:
-        from decouple import config as _config  # type: ignore
-    except Exception:
+    # Callers check _is_installed("decouple") first, which leaves the module in
+    # sys.modules; bind config from there instead of re-importing per call.
+    _config = getattr(sys.modules.get("decouple"), "config", None)
+    if _config is None:
         return _SENTINEL
     try:
         if default is _SENTINEL:
@@ -620,12 +805,25 @@ def _raw_from_decouple(key: str, default: Any = _SENTINEL) -> Any:
         return _SENTINEL
 
 
-def _raw_from_dotenv_or_os(key: str, default: Any, g: _GlobalConfig) -> Any:
-    if g.prefer_os_over_dotenv and key in os.environ:
-        return os.environ.get(key, default)
-    mapping: Mapping[str, str] = _load_dotenv_map(g.plan)
-    if key in mapping:
-        return mapping[key]
+def _raw_from_dotenv_or_os(
+    key: str,
+    default: Any,
+    g: _GlobalConfig,
+    mapping: Mapping[str, str] | None = None,
+) -> Any:
+    # One probe per layer; .env mappings never hold None values.
+    if g.prefer_os_over_dotenv:
+        raw = os.environ.get(key)
+        if raw is not None:
+            return raw
+        if mapping is None:
+            mapping = _load_dotenv_map(g.plan)
+        return mapping.get(key, default)
+    if mapping is None:
+        mapping = _load_dotenv_map(g.plan)
+    raw = mapping.get(key)
+    if raw is not None:
+        return raw
     return os.environ.get(key, default)
 
 
@@ -651,7 +849,9 @@ def get_env(
         raw = _raw_from_decouple(key, default=_SENTINEL)
     if raw is _SENTINEL:
         raw = _raw_from_dotenv_or_os(key, default, g)
-    return normalize(raw, **(normalize_kwargs or {}))
+    if not normalize_kwargs:
+        return _normalize_default(raw)
+    return normalize(raw, **normalize_kwargs)
 
 
 def get_all(
@@ -660,10 +860,20 @@ def get_all(
     *,
     normalize_kwargs: Dict[str, Any] | None = None,
 ) -> Dict[str, Any]:
+    # Same precedence as get_env(), with the per-read setup hoisted out of the loop
+    g = _ensure_global()
+    use_decouple = g.use_decouple_if_available and _is_installed("decouple")
+    mapping = _load_dotenv_map(g.plan)
     out: Dict[str, Any] = {}
     dflt = defaults or {}
     for k in keys:
-        out[k] = get_env(k, dflt.get(k), normalize_kwargs=normalize_kwargs)
+        raw = _raw_from_decouple(k, default=_SENTINEL) if use_decouple else _SENTINEL
+        if raw is _SENTINEL:
+            raw = _raw_from_dotenv_or_os(k, dflt.get(k), g, mapping)
+        if normalize_kwargs:
+            out[k] = normalize(raw, **normalize_kwargs)
+        else:
+            out[k] = _normalize_default(raw)
     return out
 
 
@@ -673,12 +883,13 @@ def _expand_env_from_sources(s: str) -> str:
     Supports ${NAME:-default} and $NAME syntax.
     Uses decouple → dotenv → os.environ precedence.
     """
+    if "$" not in s:
+        return s
     g = _ensure_global()
 
     def repl(m: re.Match) -> str:
-        if m.group("name"):
-            name = m.group("name")
-            default = m.group("default")
+        name, default, short = m.groups()
+        if name:
             # Try layered sources
             raw = _SENTINEL
             if g.use_decouple_if_available and _is_installed("decouple"):
@@ -696,7 +907,6 @@ def _expand_env_from_sources(s: str) -> str:
                 else (default if default is not None else "")
             )
         else:
-            short = m.group("short")
             raw = _SENTINEL
             if g.use_decouple_if_available and _is_installed("decouple"):
                 raw = _raw_from_decouple(short, default=_SENTINEL)
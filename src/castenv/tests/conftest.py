@@ -0,0 +1,24 @@
+# tests/conftest.py
+from __future__ import annotations
+
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def _maybe_skip_dotenv():
+    """Skip dotenv-dependent tests if python-dotenv is missing."""
+    pytest.importorskip("dotenv")
+
+
+@pytest.fixture(autouse=True)
+def _env_snapshot():
+    """Undo any os.environ changes a test makes outside of monkeypatch."""
+    before = os.environ.copy()
+    yield
+    for key in set(os.environ) - before.keys():
+        os.environ.pop(key, None)
+    for key, value in before.items():
+        if os.environ.get(key) != value:
+            os.environ[key] = value
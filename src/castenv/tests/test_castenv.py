@@ -1,8 +1,10 @@
 # tests/test_castenv.py
 from __future__ import annotations
 
+import dataclasses
 import os
 import sys
+import types
 from pathlib import Path
 import pytest
 
@@ -10,13 +12,49 @@ import castenv as env
 
 
 # -----------------------
-# Fixture to skip dotenv-dependent tests if missing
+# Shared read-only .env project
 # -----------------------
 
+_CANONICAL_ENV = (
+    b"BOOL_TRUE=true\n"
+    b"INT_VAL=42\n"
+    b"BYTES=256MB\n"
+    b"BYTES_IEC=1MiB\n"
+    b"DURATION=1m30s\n"
+    b"LIST=a,b, 3 , false\n"
+    b"LIST_SEMI=a;b;c\n"
+    b"NULLISH=null\n"
+    b"EMPTY=\n"
+    b"PCT=50%\n"
+    b'JSON_OBJ={"a":1,"b":true}\n'
+    b'JSON_QUOTED="{\\"k\\": \\"v\\"}"\n'
+    b"HEXVAL=0x2A\n"
+    b"BINVAL=0b110\n"
+    b"OCTVAL=0o10\n"
+    b"PORT=9999\n"
+    b"HOURS=2d1h\n"  # 2 days + 1 hour = 176400 seconds
+)
+
+
+@pytest.fixture(scope="module")
+def dotenv_proj(tmp_path_factory) -> Path:
+    """Project dir with the canonical .env, written and parsed once per module."""
+    d = tmp_path_factory.mktemp("proj")
+    (d / ".env").write_bytes(_CANONICAL_ENV)
+    # Pre-warm the dotenv cache; tests re-enter with refresh=False to reuse it.
+    with env.using(search_dirs=[d], refresh=False):
+        env.get_env("BOOL_TRUE")
+    return d
+
 
 @pytest.fixture
-def _maybe_skip_dotenv():
-    pytest.importorskip("dotenv")
+def castenv_using(dotenv_proj: Path):
+    """Run the test with castenv pointed at the shared project dir."""
+    with env.using(search_dirs=[dotenv_proj], refresh=False):
+        yield
+
+
+_HOME_PARTS = Path.home().parts
 
 
 # -----------------------
@@ -26,10 +64,8 @@ def _maybe_skip_dotenv():
 
 def test_non_string_defaults_passthrough(monkeypatch):
     # Ensure vars are not set
-    monkeypatch.delenv("DEBUG2", raising=False)
-    monkeypatch.delenv("PORT", raising=False)
-    monkeypatch.delenv("OPTS", raising=False)
-    monkeypatch.delenv("RATE", raising=False)
+    for key in ("DEBUG2", "PORT", "OPTS", "RATE"):
+        monkeypatch.delenv(key, raising=False)
 
     assert env.get_env("DEBUG2", True) is True
     assert env.get_env("PORT", 8080) == 8080
@@ -63,15 +99,58 @@ def test_enum_validation_raises(monkeypatch):
         )
 
 
-def test_hex_bin_oct_and_float_numbers_via_env(monkeypatch):
-    monkeypatch.setenv("HEX", "0xFF")
-    monkeypatch.setenv("BIN", "0b1010")
-    monkeypatch.setenv("OCT", "0o10")
-    monkeypatch.setenv("SCI", "1e-3")
-    assert env.get_env("HEX") == 255
-    assert env.get_env("BIN") == 10
-    assert env.get_env("OCT") == 8
-    assert env.env_float("SCI", 0.0) == 0.001
+@pytest.mark.parametrize(
+    "raw,expected",
+    [("0xFF", 255), ("0b1010", 10), ("0o10", 8), ("1e-3", 0.001)],
+    ids=["hex", "bin", "oct", "sci"],
+)
+def test_hex_bin_oct_and_float_numbers_via_env(monkeypatch, raw, expected):
+    monkeypatch.setenv("NUMVAL", raw)
+    assert env.get_env("NUMVAL") == expected
+    assert env.env_float("NUMVAL", 0.0) == float(expected)
+
+
+def test_plain_integers_and_digit_booleans():
+    assert env.normalize("8080") == 8080
+    assert env.normalize("-42") == -42
+    assert env.normalize("+-5") == "+-5"
+    # "0"/"1" are boolean sentinels unless boolean parsing is disabled
+    assert env.normalize("1") is True
+    assert env.normalize("0", parse_booleans=False) == 0
+
+
+def test_quoted_numbers_tolerate_padding():
+    # Blanks left inside the quotes are ignored on either side of a number
+    assert env.normalize("'0xff '") == 255
+    assert env.normalize('" 0b11"') == 3
+    assert env.normalize("' 7 '", parse_bytesize=False) == 7
+
+
+def test_unitless_decimals_are_floats_not_byte_sizes():
+    assert env.normalize("1.5") == 1.5
+    assert env.normalize("-2.25") == -2.25
+    assert env.normalize("1.5KiB") == 1536
+    # Quoted numbers may keep blanks inside the quotes
+    assert env.normalize('" 42 "') == 42
+    assert env.normalize("' 1.5 '") == 1.5
+    # Without a unit the size parser no longer picks up bare numbers
+    assert env.normalize("8080", parse_numbers=False) == "8080"
+
+
+def test_normalize_results_are_not_shared():
+    first = env.normalize("a,b")
+    first.append("c")
+    assert env.normalize("a,b") == ["a", "b"]
+    nested = env.normalize('x,{"k":1}')
+    nested[1]["k"] = 2
+    assert env.normalize('x,{"k":1}') == ["x", {"k": 1}]
+
+
+def test_normalize_interpolation_tracks_environment(monkeypatch):
+    monkeypatch.setenv("CHANGING", "1s")
+    assert env.normalize("${CHANGING}") == 1.0
+    monkeypatch.setenv("CHANGING", "2s")
+    assert env.normalize("${CHANGING}") == 2.0
 
 
 def test_percent_modes(monkeypatch):
@@ -133,59 +212,37 @@ def test_interpolation_short_missing_becomes_empty(monkeypatch):
 
 
 @pytest.mark.usefixtures("_maybe_skip_dotenv")
-def test_basic_normalization_from_dotenv(tmp_path: Path):
-    dotenv_dir = tmp_path / "proj"
-    dotenv_dir.mkdir()
-    (dotenv_dir / ".env").write_text(
-        "BOOL_TRUE=true\n"
-        "INT_VAL=42\n"
-        "BYTES=256MB\n"
-        "BYTES_IEC=1MiB\n"
-        "DURATION=1m30s\n"
-        "LIST=a,b, 3 , false\n"
-        "LIST_SEMI=a;b;c\n"
-        "NULLISH=null\n"
-        "EMPTY=\n"
-        "PCT=50%\n"
-        'JSON_OBJ={"a":1,"b":true}\n'
-        'JSON_QUOTED="{\\"k\\": \\"v\\"}"\n'
-        "HEXVAL=0x2A\n"
-        "BINVAL=0b110\n"
-        "OCTVAL=0o10\n"
-    )
-
-    with env.using(search_dirs=[dotenv_dir]):
-        assert env.env_bool("BOOL_TRUE", False) is True
-        assert env.env_int("INT_VAL", 0) == 42
+def test_basic_normalization_from_dotenv(castenv_using):
+    assert env.env_bool("BOOL_TRUE", False) is True
+    assert env.env_int("INT_VAL", 0) == 42
 
-        assert env.get_env("BYTES") == 256 * 1000 * 1000
-        assert env.get_env("BYTES_IEC") == 1024 * 1024
+    assert env.get_env("BYTES") == 256 * 1000 * 1000
+    assert env.get_env("BYTES_IEC") == 1024 * 1024
 
-        assert env.get_env("DURATION") == 90.0
+    assert env.get_env("DURATION") == 90.0
 
-        lst = env.get_env("LIST", normalize_kwargs={"parse_lists": True})
-        assert lst == ["a", "b", 3, False]
+    lst = env.get_env("LIST", normalize_kwargs={"parse_lists": True})
+    assert lst == ["a", "b", 3, False]
 
-        lst2 = env.env_list("LIST_SEMI", separators=("\u003b",))  # ';'
-        assert lst2 == ["a", "b", "c"]
+    lst2 = env.env_list("LIST_SEMI", separators=("\u003b",))  # ';'
+    assert lst2 == ["a", "b", "c"]
 
-        assert env.get_env("NULLISH") is None
-        assert env.get_env("EMPTY") is None
+    assert env.get_env("NULLISH") is None
+    assert env.get_env("EMPTY") is None
 
-        assert env.get_env("PCT", normalize_kwargs={"percent_mode": "fraction"}) == 0.5
+    assert env.get_env("PCT", normalize_kwargs={"percent_mode": "fraction"}) == 0.5
 
-        assert env.get_env("JSON_OBJ") == {"a": 1, "b": True}
-        assert env.get_env("JSON_QUOTED") == {"k": "v"}
+    assert env.get_env("JSON_OBJ") == {"a": 1, "b": True}
+    assert env.get_env("JSON_QUOTED") == {"k": "v"}
 
-        assert env.get_env("HEXVAL") == 42
-        assert env.get_env("BINVAL") == 6
-        assert env.get_env("OCTVAL") == 8
+    assert env.get_env("HEXVAL") == 42
+    assert env.get_env("BINVAL") == 6
+    assert env.get_env("OCTVAL") == 8
 
 
 @pytest.mark.usefixtures("_maybe_skip_dotenv")
-def test_env_interpolation_and_home_expansion(tmp_path: Path, monkeypatch):
-    d = tmp_path / "proj"
-    d.mkdir()
+def test_env_interpolation_and_home_expansion(tmp_path_factory, monkeypatch):
+    d = tmp_path_factory.mktemp("proj")
     (d / ".env").write_text(
         "API_URL=${BASE_URL:-http://localhost}/v1\n"
         'HOMEFILE="~/myapp/logs.txt"\n'
@@ -193,18 +250,17 @@ def test_env_interpolation_and_home_expansion(tmp_path: Path, monkeypatch):
     )
     monkeypatch.setenv("BASE_URL", "https://example.com")
 
-    with env.using(search_dirs=[d]):
+    with env.using(search_dirs=[d], refresh=False):
         assert env.get_env("API_URL") == "https://example.com/v1"
 
         homefile = env.get_env("HOMEFILE")
         hp = Path(homefile)
-        home = Path.home()
 
         # It's an absolute path under the user's home, regardless of slash style.
         assert hp.is_absolute()
-        assert hp.parts[: len(home.parts)] == home.parts
+        assert hp.parts[: len(_HOME_PARTS)] == _HOME_PARTS
         # And the tail is as expected
-        assert hp.as_posix().endswith("myapp/logs.txt")
+        assert hp.parts[-2:] == ("myapp", "logs.txt")
 
         # Quoted string unescapes newlines
         q = env.get_env("QUOTED_STR")
@@ -212,56 +268,52 @@ def test_env_interpolation_and_home_expansion(tmp_path: Path, monkeypatch):
 
 
 @pytest.mark.usefixtures("_maybe_skip_dotenv")
-def test_os_overrides_dotenv_by_default(tmp_path: Path, monkeypatch):
-    d = tmp_path / "proj"
-    d.mkdir()
-    (d / ".env").write_text("PORT=9999\n")
+def test_os_overrides_dotenv_by_default(castenv_using, monkeypatch):
     monkeypatch.setenv("PORT", "8080")
-
-    with env.using(search_dirs=[d]):
-        assert env.env_int("PORT", 0) == 8080  # OS wins by default
+    assert env.env_int("PORT", 0) == 8080  # OS wins by default
 
 
 @pytest.mark.usefixtures("_maybe_skip_dotenv")
-def test_dotenv_can_override_os_when_configured(tmp_path: Path, monkeypatch):
-    d = tmp_path / "proj"
-    d.mkdir()
-    (d / ".env").write_text("PORT=9999\n")
+def test_dotenv_can_override_os_when_configured(dotenv_proj: Path, monkeypatch):
     monkeypatch.setenv("PORT", "8080")
 
     # Disable decouple for this context so dotenv can take precedence
     with env.using(
-        search_dirs=[d], prefer_os_over_dotenv=False, use_decouple_if_available=False
+        search_dirs=[dotenv_proj],
+        refresh=False,
+        prefer_os_over_dotenv=False,
+        use_decouple_if_available=False,
     ):
         assert env.env_int("PORT", 0) == 9999  # dotenv wins when configured
 
 
 @pytest.mark.usefixtures("_maybe_skip_dotenv")
-def test_composite_duration(tmp_path: Path):
-    d = tmp_path / "proj"
-    d.mkdir()
-    (d / ".env").write_text("HOURS=2d1h\n")  # 2 days + 1 hour = 176400 seconds
-
-    with env.using(search_dirs=[d]):
-        assert env.get_env("HOURS") == 2 * 86400 + 3600  # 176400.0
+def test_composite_duration(castenv_using):
+    assert env.get_env("HOURS") == 2 * 86400 + 3600  # 176400.0
+
+
+def test_search_plan_fields_exclude_cache_key(tmp_path: Path):
+    plan = env.DotenvSearchPlan(search_dirs=[tmp_path], env_name="")
+    plan._cache_key()
+    assert dataclasses.asdict(plan) == {
+        "search_dirs": [tmp_path],
+        "env_name": "",
+        "filenames": None,
+        "stop_at_first_found_dir": True,
+    }
 
 
 @pytest.mark.usefixtures("_maybe_skip_dotenv")
-def test_refresh_dotenv_cache(tmp_path: Path):
-    d = tmp_path / "proj"
-    d.mkdir()
-    p = d / ".env"
-    p.write_text("FOO=1\n")
-
-    with env.using(search_dirs=[d]):
-        assert env.get_env("FOO") == 1
-        # modify file; cached mapping would hide the change unless we refresh
-        p.write_text("FOO=2\n")
-        # still reads from cache (1)
-        assert env.get_env("FOO") == 1
-        # now clear cache and re-read
-        env.refresh_dotenv_cache()
-        assert env.get_env("FOO") == 2
+def test_later_env_files_take_precedence(tmp_path_factory):
+    d = tmp_path_factory.mktemp("proj")
+    (d / ".env").write_text("LAYER=base\nBASE_ONLY=1\n")
+    (d / ".env.local").write_text("LAYER=local\n")
+
+    with env.using(
+        search_dirs=[d], env_name="", use_decouple_if_available=False, refresh=False
+    ):
+        assert env.get_env("LAYER") == "local"
+        assert env.get_env("BASE_ONLY") == 1
 
 
 @pytest.mark.usefixtures("_maybe_skip_dotenv")
@@ -273,15 +325,12 @@ def test_parent_discovery_order(tmp_path: Path):
     (parent / ".env").write_text("K=parent\n")
 
     # Search child then parent; should discover in parent
-    with env.using(search_dirs=[child, parent]):
+    with env.using(search_dirs=[child, parent], refresh=False):
         assert env.get_env("K") == "parent"
 
 
 @pytest.mark.usefixtures("_maybe_skip_dotenv")
-def test_using_context_restores(monkeypatch, tmp_path: Path):
-    d = tmp_path / "proj"
-    d.mkdir()
-    (d / ".env").write_text("PORT=9999\n")
+def test_using_context_restores(monkeypatch, dotenv_proj: Path):
     monkeypatch.setenv("PORT", "8080")
 
     # default: OS wins
@@ -289,7 +338,10 @@ def test_using_context_restores(monkeypatch, tmp_path: Path):
 
     # override: dotenv wins inside context (also disable decouple precedence)
     with env.using(
-        search_dirs=[d], prefer_os_over_dotenv=False, use_decouple_if_available=False
+        search_dirs=[dotenv_proj],
+        refresh=False,
+        prefer_os_over_dotenv=False,
+        use_decouple_if_available=False,
     ):
         assert env.env_int("PORT", 0) == 9999
 
@@ -302,29 +354,30 @@ def test_using_context_restores(monkeypatch, tmp_path: Path):
 # -----------------------
 
 
-def test_decouple_is_used_if_present(monkeypatch):
+@pytest.fixture
+def fake_decouple(monkeypatch):
+    """Install a minimal 'decouple' module; returns the list of keys looked up."""
+    calls: list[str] = []
+
+    def config(key, default=None):
+        # Mimic OS precedence: return env if set, else default or raise
+        calls.append(key)
+        if key in os.environ:
+            return os.environ[key]
+        if default is None:
+            raise KeyError(key)
+        return default
+
+    mod = types.ModuleType("decouple")
+    mod.config = config  # type: ignore[attr-defined]
+    monkeypatch.setitem(sys.modules, "decouple", mod)
+    return calls
+
+
+def test_decouple_is_used_if_present(monkeypatch, fake_decouple):
     """
     Mock a minimal 'decouple' module to ensure get_env() consults it first.
     """
-
-    class DummyDecouple:
-        def __init__(self):
-            self.called = []
-
-        def config(self, key, default=None):
-            # Mimic OS precedence: return env if set, else default or raise
-            self.called.append(key)
-            if key in os.environ:
-                return os.environ[key]
-            if default is None:
-                raise KeyError(key)
-            return default
-
-    dummy = DummyDecouple()
-    # Insert dummy module
-    sys.modules["decouple"] = type(sys)("decouple")
-    sys.modules["decouple"].config = dummy.config  # type: ignore[attr-defined]
-
     # Ensure no env var for this key
     monkeypatch.delenv("DKEY", raising=False)
 
@@ -333,13 +386,28 @@ def test_decouple_is_used_if_present(monkeypatch):
     # castenv then falls back to dotenv/os path returning provided default.
     v = env.get_env("DKEY", "fallback")
     assert v == "fallback"
-    assert "DKEY" in dummy.called
+    assert "DKEY" in fake_decouple
 
     # If OS env exists, dummy returns it (simulating decouple OS precedence)
     monkeypatch.setenv("DKEY", "from_os")
     assert env.get_env("DKEY", "fallback") == "from_os"
 
 
+@pytest.mark.usefixtures("_maybe_skip_dotenv")
+def test_blocked_optional_imports_fall_back(tmp_path_factory, monkeypatch):
+    # A None entry in sys.modules is the standard way to block an import
+    d = tmp_path_factory.mktemp("proj")
+    (d / ".env").write_text("BLOCKED=from-dotenv\n")
+    monkeypatch.delenv("BLOCKED", raising=False)
+    monkeypatch.setitem(sys.modules, "dotenv", None)
+    monkeypatch.setitem(sys.modules, "decouple", None)
+
+    with env.using(search_dirs=[d], refresh=False):
+        assert env.get_env("BLOCKED", "fallback") == "fallback"
+        monkeypatch.setenv("BLOCKED", "from_os")
+        assert env.get_env("BLOCKED", "fallback") == "from_os"
+
+
 # -----------------------
 # get_all convenience
 # -----------------------
@@ -353,30 +421,36 @@ def test_get_all_with_defaults(monkeypatch):
     assert out["TWO"] == 2  # default normalized from string
 
 
-# tests/test_duration_parsing.py
-import pytest
-import castenv as env
+# -----------------------
+# Duration parsing & quoted strings
+# -----------------------
 
 
-def test_duration_each_unit():
-    # ns → seconds
-    assert env.normalize("1000000000ns") == pytest.approx(1.0)
-    # us and µs (micro sign) → seconds
-    assert env.normalize("250000us") == pytest.approx(0.25)
-    assert env.normalize("1µs") == pytest.approx(1e-6)
-    # ms → seconds (supports decimals)
-    assert env.normalize("1.5ms") == pytest.approx(0.0015)
-    # s, m, h, d, w
-    assert env.normalize("2s") == pytest.approx(2.0)
-    assert env.normalize("1.5m") == pytest.approx(90.0)
-    assert env.normalize("1.5h") == pytest.approx(5400.0)
-    assert env.normalize("2d") == pytest.approx(172800.0)
-    assert env.normalize("1w") == pytest.approx(604800.0)
+@pytest.mark.parametrize(
+    "raw,expected",
+    [
+        # ns → seconds
+        ("1000000000ns", pytest.approx(1.0)),
+        # us and µs (micro sign) → seconds
+        ("250000us", pytest.approx(0.25)),
+        ("1µs", pytest.approx(1e-6)),
+        # ms → seconds (supports decimals)
+        ("1.5ms", pytest.approx(0.0015)),
+        # s, m, h, d, w are exact in binary floating point
+        ("2s", 2.0),
+        ("1.5m", 90.0),
+        ("1.5h", 5400.0),
+        ("2d", 172800.0),
+        ("1w", 604800.0),
+    ],
+)
+def test_duration_each_unit(raw, expected):
+    assert env.normalize(raw) == expected
 
 
 def test_duration_composite_contiguous():
     # Composite tokens must be contiguous: 1h30m15s
-    assert env.normalize("1h30m15s") == pytest.approx(3600 + 1800 + 15)
+    assert env.normalize("1h30m15s") == 3600 + 1800 + 15
 
 
 def test_duration_non_contiguous_or_trailing_garbage_returns_string():
@@ -386,28 +460,36 @@ def test_duration_non_contiguous_or_trailing_garbage_returns_string():
     assert env.normalize("1h30mX") == "1h30mX"
 
 
+def test_quoted_empty_string_is_not_a_zero_duration():
+    assert env.normalize('""') == ""
+
+
+# A quoted value containing every escape we handle. The surrounding quotes
+# make normalize() take the quoted path (and _unescape_quoted).
+_UNESCAPE_INPUT = '"' + r"A\\B\"C\'D\nN\rR\tT\bB\fF\0Z" + '"'
+
+# Expected string after unescaping:
+#  \\  -> \
+#  \"  -> "
+#  \'  -> '
+#  \n  -> newline
+#  \r  -> carriage return
+#  \t  -> tab
+#  \b  -> backspace
+#  \f  -> form feed
+#  \0  -> null byte
+_UNESCAPE_EXPECTED = "A\\B\"C'D\nN\rR\tT\bB\fF\0Z"
+
+
 def test_unescape_quoted_all_sequences():
-    # Build a quoted string containing every escape we handle.
-    # Use raw content inside and wrap with explicit quotes so normalize()
-    # triggers the quoted-path (and _unescape_quoted). Disable JSON parsing
-    # so we assert the unescaped result directly.
-    raw_inside = r"A\\B\"C\'D\nN\rR\tT\bB\fF\0Z"
-    value = '"' + raw_inside + '"'
-
-    out = env.normalize(value, parse_json=False)
-
-    # Expected string after unescaping:
-    #  \\  -> \
-    #  \"  -> "
-    #  \'  -> '
-    #  \n  -> newline
-    #  \r  -> carriage return
-    #  \t  -> tab
-    #  \b  -> backspace
-    #  \f  -> form feed
-    #  \0  -> null byte
-    expected = "A\\B\"C'D\nN\rR\tT\bB\fF\0Z"
-    assert out == expected
+    # Disable JSON parsing so we assert the unescaped result directly.
+    assert env.normalize(_UNESCAPE_INPUT, parse_json=False) == _UNESCAPE_EXPECTED
+
+
+def test_unescape_escaped_backslash_is_not_reused():
+    # "\\n" is an escaped backslash followed by "n", not a newline.
+    out = env.normalize('"A\\\\nB"', parse_json=False)
+    assert out == "A\\nB"
 
 
 def test_no_unescape_without_quotes():
@@ -422,108 +504,167 @@ def test_no_unescape_without_quotes():
 # -----------------------
 
 
-def test_normalize_config_string_with_env_expansion(monkeypatch):
-    """Test that environment variables are expanded in strings."""
-    monkeypatch.setenv("USER_NAME", "alice")
-    result = env.normalize_config("Hello ${USER_NAME}")
-    assert result == "Hello alice"
-
-
-def test_normalize_config_string_with_casting(monkeypatch):
-    """Test that expanded strings are normalized/cast."""
-    monkeypatch.setenv("DEBUG_VAL", "true")
-    result = env.normalize_config("${DEBUG_VAL}")
-    assert result is True
-
-
-def test_normalize_config_dict_recursive(monkeypatch):
-    """Test recursive processing of dictionaries."""
-    monkeypatch.setenv("DB_HOST", "localhost")
-    monkeypatch.setenv("DB_PORT", "5432")
-    monkeypatch.setenv("DB_DEBUG", "false")
-
-    config = {
-        "host": "${DB_HOST}",
-        "port": "${DB_PORT}",
-        "debug": "${DB_DEBUG}",
-    }
-
-    result = env.normalize_config(config)
-
-    assert result["host"] == "localhost"
-    assert result["port"] == 5432
-    assert result["debug"] is False
-
-
-def test_normalize_config_list_recursive(monkeypatch):
-    """Test recursive processing of lists."""
-    monkeypatch.setenv("PORTS", "8000,8001,8002")
-    monkeypatch.setenv("ENABLED", "true")
-
-    config = [
-        "${PORTS}",
-        "${ENABLED}",
-        "static_value",
-    ]
-
-    result = env.normalize_config(config)
-
-    assert result[0] == [8000, 8001, 8002]  # List parsed and numbers cast
-    assert result[1] is True
-    assert result[2] == "static_value"
-
-
-def test_normalize_config_nested_structures(monkeypatch):
-    """Test deeply nested dicts and lists."""
-    monkeypatch.setenv("API_URL", "https://api.example.com")
-    monkeypatch.setenv("TIMEOUT", "30s")
-    monkeypatch.setenv("RETRIES", "3")
-    monkeypatch.setenv("TAGS", "prod,stable,v1")
-
-    config = {
-        "api": {
-            "url": "${API_URL}",
-            "settings": {
-                "timeout": "${TIMEOUT}",
-                "retries": "${RETRIES}",
+# Variables referenced by the normalize_config cases below; None means unset.
+# The CFG_ prefix keeps them from colliding with names other tests use.
+_CONFIG_ENV = {
+    "CFG_USER_NAME": "alice",
+    "CFG_DEBUG_VAL": "true",
+    "CFG_DB_HOST": "localhost",
+    "CFG_DB_PORT": "5432",
+    "CFG_DB_DEBUG": "false",
+    "CFG_PORTS": "8000,8001,8002",
+    "CFG_ENABLED": "true",
+    "CFG_API_URL": "https://api.example.com",
+    "CFG_TIMEOUT": "30s",
+    "CFG_RETRIES": "3",
+    "CFG_TAGS": "prod,stable,v1",
+    "CFG_CONFIG_JSON": '{"key": "value", "count": 10}',
+    "CFG_CSV_LIST": "a,b,c",
+    "CFG_UNDEFINED_VAR": None,
+}
+
+
+@pytest.fixture(scope="module")
+def config_env():
+    """Apply _CONFIG_ENV once for the module and restore the old values after."""
+    saved = {k: os.environ.get(k) for k in _CONFIG_ENV}
+    try:
+        for k, v in _CONFIG_ENV.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+        yield
+    finally:
+        for k, v in saved.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+def _strict(obj):
+    """Pair every leaf with its type so True/1 and 30/30.0 don't compare equal."""
+    if isinstance(obj, dict):
+        return {k: _strict(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_strict(v) for v in obj]
+    return (type(obj), obj)
+
+
+@pytest.mark.parametrize(
+    "config,kwargs,expected",
+    [
+        # Environment variables are expanded in strings
+        ("Hello ${CFG_USER_NAME}", {}, "Hello alice"),
+        # Expanded strings are normalized/cast
+        ("${CFG_DEBUG_VAL}", {}, True),
+        # Recursive processing of dictionaries
+        (
+            {
+                "host": "${CFG_DB_HOST}",
+                "port": "${CFG_DB_PORT}",
+                "debug": "${CFG_DB_DEBUG}",
             },
-        },
-        "tags": "${TAGS}",
-        "servers": [
-            {"name": "server1", "port": "8080"},
-            {"name": "server2", "port": "8081"},
-        ],
-    }
-
-    result = env.normalize_config(config)
-
-    assert result["api"]["url"] == "https://api.example.com"
-    assert result["api"]["settings"]["timeout"] == 30.0
-    assert result["api"]["settings"]["retries"] == 3
-    assert result["tags"] == ["prod", "stable", "v1"]
-    assert result["servers"][0]["port"] == 8080
-    assert result["servers"][1]["port"] == 8081
-
-
-def test_normalize_config_non_string_passthrough(monkeypatch):
-    """Test that non-string types pass through unchanged."""
-    config = {
-        "count": 42,
-        "ratio": 3.14,
-        "flag": True,
-        "items": [1, 2, 3],
-        "meta": {"nested": True},
-        "nothing": None,
-    }
-
-    result = env.normalize_config(config)
-
-    assert result["count"] == 42
-    assert result["ratio"] == 3.14
-    assert result["flag"] is True
-    assert result["items"] == [1, 2, 3]
-    assert result["meta"] == {"nested": True}
-    assert result["nothing"] is None
+            {},
+            {"host": "localhost", "port": 5432, "debug": False},
+        ),
+        # Recursive processing of lists; list parsed and numbers cast
+        (
+            ["${CFG_PORTS}", "${CFG_ENABLED}", "static_value"],
+            {},
+            [[8000, 8001, 8002], True, "static_value"],
+        ),
+        # Deeply nested dicts and lists
+        (
+            {
+                "api": {
+                    "url": "${CFG_API_URL}",
+                    "settings": {
+                        "timeout": "${CFG_TIMEOUT}",
+                        "retries": "${CFG_RETRIES}",
+                    },
+                },
+                "tags": "${CFG_TAGS}",
+                "servers": [
+                    {"name": "server1", "port": "8080"},
+                    {"name": "server2", "port": "8081"},
+                ],
+            },
+            {},
+            {
+                "api": {
+                    "url": "https://api.example.com",
+                    "settings": {"timeout": 30.0, "retries": 3},
+                },
+                "tags": ["prod", "stable", "v1"],
+                "servers": [
+                    {"name": "server1", "port": 8080},
+                    {"name": "server2", "port": 8081},
+                ],
+            },
+        ),
+        # Non-string types pass through unchanged
+        (
+            {
+                "count": 42,
+                "ratio": 3.14,
+                "flag": True,
+                "items": [1, 2, 3],
+                "meta": {"nested": True},
+                "nothing": None,
+            },
+            {},
+            {
+                "count": 42,
+                "ratio": 3.14,
+                "flag": True,
+                "items": [1, 2, 3],
+                "meta": {"nested": True},
+                "nothing": None,
+            },
+        ),
+        # JSON object expansion in env vars
+        (
+            {"settings": "${CFG_CONFIG_JSON}"},
+            {},
+            {"settings": {"key": "value", "count": 10}},
+        ),
+        # Parsing can be disabled via kwargs; not parsed as list
+        ({"items": "${CFG_CSV_LIST}"}, {"parse_lists": False}, {"items": "a,b,c"}),
+        # Empty strings
+        ({"optional": ""}, {"coerce_empty_to_none": True}, {"optional": None}),
+        ({"optional": ""}, {"coerce_empty_to_none": False}, {"optional": ""}),
+        # Undefined vars in expansions become empty
+        ("prefix_${CFG_UNDEFINED_VAR}_suffix", {}, "prefix__suffix"),
+    ],
+    ids=[
+        "string_with_env_expansion",
+        "string_with_casting",
+        "dict_recursive",
+        "list_recursive",
+        "nested_structures",
+        "non_string_passthrough",
+        "json_expansion",
+        "disable_parsing",
+        "empty_string_to_none",
+        "empty_string_kept",
+        "missing_env_var",
+    ],
+)
+@pytest.mark.usefixtures("config_env")
+def test_normalize_config_cases(config, kwargs, expected):
+    result = env.normalize_config(config, **kwargs)
+
+    assert _strict(result) == _strict(expected)
+
+
+def test_normalize_config_self_reference_raises():
+    """A config that contains itself fails instead of looping forever."""
+    config: dict = {"name": "svc"}
+    config["self"] = config
+    with pytest.raises(RecursionError):
+        env.normalize_config(config)
 
 
 def test_normalize_config_with_expanduser(monkeypatch):
@@ -542,52 +683,6 @@ def test_normalize_config_with_expanduser(monkeypatch):
     assert "config" in result["config_dir"]
 
 
-def test_normalize_config_with_json_expansion(monkeypatch):
-    """Test JSON object expansion in env vars."""
-    monkeypatch.setenv("CONFIG_JSON", '{"key": "value", "count": 10}')
-
-    config = {"settings": "${CONFIG_JSON}"}
-
-    result = env.normalize_config(config)
-
-    assert result["settings"] == {"key": "value", "count": 10}
-
-
-def test_normalize_config_disable_parsing(monkeypatch):
-    """Test that parsing can be disabled via kwargs."""
-    monkeypatch.setenv("CSV_LIST", "a,b,c")
-
-    # With parse_lists disabled
-    result = env.normalize_config(
-        {"items": "${CSV_LIST}"},
-        parse_lists=False,
-    )
-
-    assert result["items"] == "a,b,c"  # Not parsed as list
-
-
-def test_normalize_config_empty_string(monkeypatch):
-    """Test handling of empty strings."""
-    config = {
-        "optional": "",
-    }
-
-    result = env.normalize_config(config, coerce_empty_to_none=True)
-    assert result["optional"] is None
-
-    result = env.normalize_config(config, coerce_empty_to_none=False)
-    assert result["optional"] == ""
-
-
-def test_normalize_config_missing_env_var(monkeypatch):
-    """Test behavior with undefined env vars in expansions."""
-    monkeypatch.delenv("UNDEFINED_VAR", raising=False)
-
-    # os.path.expandvars leaves undefined vars as-is
-    result = env.normalize_config("prefix_${UNDEFINED_VAR}_suffix")
-    assert result == "prefix__suffix"
-
-
 # -----------------------
 # normalize_config with layered sources tests
 # -----------------------
@@ -605,7 +700,7 @@ def test_normalize_config_layered_sources_os_takes_precedence(
     monkeypatch.setenv("API_PORT", "9000")
 
     # Configure to use our temp directory
-    with env.using(search_dirs=[tmp_path]):
+    with env.using(search_dirs=[tmp_path], refresh=False):
         config = {
             "api_key": "${API_KEY}",  # From dotenv
             "api_port": "${API_PORT}",  # From os.environ (overrides dotenv)
@@ -628,7 +723,7 @@ def test_normalize_config_layered_sources_dotenv_fallback(
     monkeypatch.delenv("DB_HOST", raising=False)
     monkeypatch.delenv("DB_PORT", raising=False)
 
-    with env.using(search_dirs=[tmp_path]):
+    with env.using(search_dirs=[tmp_path], refresh=False):
         config = {
             "host": "${DB_HOST}",
             "port": "${DB_PORT}",
@@ -668,7 +763,7 @@ def test_normalize_config_mixed_sources_with_defaults(
     monkeypatch.setenv("API_PORT", "8080")
     monkeypatch.delenv("API_DEBUG", raising=False)
 
-    with env.using(search_dirs=[tmp_path]):
+    with env.using(search_dirs=[tmp_path], refresh=False):
         config = {
             "api": {
                 "key": "${API_KEY}",  # From dotenv
@@ -699,11 +794,10 @@ def test_normalize_config_multiple_env_vars_same_source(
         "FEATURES=auth,logging,monitoring"
     )
 
-    monkeypatch.delenv("ALLOWED_HOSTS", raising=False)
-    monkeypatch.delenv("TIMEOUTS", raising=False)
-    monkeypatch.delenv("FEATURES", raising=False)
+    for key in ("ALLOWED_HOSTS", "TIMEOUTS", "FEATURES"):
+        monkeypatch.delenv(key, raising=False)
 
-    with env.using(search_dirs=[tmp_path]):
+    with env.using(search_dirs=[tmp_path], refresh=False):
         config = {
             "hosts": "${ALLOWED_HOSTS}",
             "timeouts": "${TIMEOUTS}",
@@ -743,7 +837,7 @@ def test_normalize_config_complex_precedence_scenario(
     # One var with no source (uses default)
     monkeypatch.delenv("MAX_CONNECTIONS", raising=False)
 
-    with env.using(search_dirs=[tmp_path]):
+    with env.using(search_dirs=[tmp_path], refresh=False):
         config = {
             "service": {
                 "name": "${SERVICE_NAME}",  # From dotenv
@@ -789,7 +883,7 @@ def test_normalize_config_short_form_vars_with_layered_sources(
     monkeypatch.setenv("PORT", "8080")
     monkeypatch.delenv("HOST", raising=False)
 
-    with env.using(search_dirs=[tmp_path]):
+    with env.using(search_dirs=[tmp_path], refresh=False):
         config = {
             "host": "$HOST",  # From dotenv (short form)
             "port": "$PORT",  # From os.environ (short form)
@@ -811,13 +905,13 @@ def test_normalize_config_with_decouple_precedence(monkeypatch, _maybe_skip_dote
     }
 
     # First without decouple (should use os.environ)
-    with env.using(use_decouple_if_available=False):
+    with env.using(use_decouple_if_available=False, refresh=False):
         result = env.normalize_config(config)
         assert result["value"] == "from-os-environ"
 
     # With decouple enabled (if installed)
     # The behavior depends on whether decouple is installed
-    with env.using(use_decouple_if_available=True):
+    with env.using(use_decouple_if_available=True, refresh=False):
         result = env.normalize_config(config)
         # If decouple is installed, it will be used; otherwise falls back to os.environ
         assert result["value"] == "from-os-environ"  # At least os.environ works
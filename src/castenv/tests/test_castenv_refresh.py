@@ -0,0 +1,72 @@
+# tests/test_castenv_refresh.py
+from __future__ import annotations
+
+import pytest
+
+import castenv as env
+
+
+# -----------------------
+# Dotenv cache invalidation
+#
+# These tests rewrite .env files and clear the global dotenv cache. Every
+# using() in test_castenv.py passes refresh=False, so that module parses its
+# shared .env once; keeping the clearing tests in their own module means they
+# run before or after that block, never between its tests.
+# -----------------------
+
+
+@pytest.mark.usefixtures("_maybe_skip_dotenv")
+def test_refresh_dotenv_cache(tmp_path_factory):
+    d = tmp_path_factory.mktemp("proj")
+    p = d / ".env"
+    p.write_text("FOO=1\n")
+
+    with env.using(search_dirs=[d]):
+        assert env.get_env("FOO") == 1
+        # modify file; cached mapping would hide the change unless we refresh
+        p.write_text("FOO=2\n")
+        # still reads from cache (1)
+        assert env.get_env("FOO") == 1
+        # now clear cache and re-read
+        env.refresh_dotenv_cache()
+        assert env.get_env("FOO") == 2
+
+
+@pytest.mark.usefixtures("_maybe_skip_dotenv")
+def test_using_without_refresh_keeps_cached_dotenv(tmp_path_factory):
+    d = tmp_path_factory.mktemp("proj")
+    p = d / ".env"
+    p.write_text("FOO=1\n")
+
+    with env.using(search_dirs=[d]):
+        assert env.get_env("FOO") == 1
+    p.write_text("FOO=2\n")
+    # re-entering without refresh reuses the mapping parsed above
+    with env.using(search_dirs=[d], refresh=False):
+        assert env.get_env("FOO") == 1
+    # default using() clears the cache
+    with env.using(search_dirs=[d]):
+        assert env.get_env("FOO") == 2
+
+
+@pytest.mark.usefixtures("_maybe_skip_dotenv")
+def test_using_without_refresh_respects_stop_at_first_found_dir(tmp_path_factory):
+    parent = tmp_path_factory.mktemp("parent")
+    child = parent / "child"
+    child.mkdir()
+    (parent / ".env").write_text("K=parent\nX=p\n")
+    (child / ".env").write_text("K=child\n")
+
+    with env.using(search_dirs=[child, parent], env_name=""):
+        assert env.get_env("K") == "child"
+        assert env.get_env("X") is None
+    # the cached stop=True mapping must not answer for stop=False
+    with env.using(
+        search_dirs=[child, parent],
+        env_name="",
+        stop_at_first_found_dir=False,
+        refresh=False,
+    ):
+        assert env.get_env("K") == "parent"
+        assert env.get_env("X") == "p"